@@ -1,7 +1,11 @@
 import pygame
 import sys
 import math
-from logic import GameLogic, BallState, Color
+import random
+
+import numpy as np
+
+from logic import GameLogic, BallState, unpack_color
 
 class BallGame:
     """Основной класс игры с визуальным интерфейсом"""
@@ -30,6 +34,18 @@ class BallGame:
         self.initial_balls = 8  # Стартовое количество шариков
         self.is_dragging = False
         self.dragged_ball = None
+        self._rng = np.random.default_rng()  # Пакетная генерация радиусов
+
+        # Кэш отрисованных шариков: (радиус, квантованный цвет) -> Surface.
+        # Тень, заливка и обводка растеризуются один раз, дальше шарик
+        # просто блитится. Цвета при смешивании сходятся, поэтому после
+        # пары секунд игры почти все обращения попадают в кэш.
+        self._ball_surf_cache = {}
+        self._ball_surf_cache_limit = 256
+
+        # Масштаб пульсации перетаскиваемого шарика; пересчитывается
+        # один раз за кадр в run
+        self._pulse_scale = 1.2
         
         # Цвета UI
         self.bg_color = (255, 255, 255)  # Белый фон
@@ -37,20 +53,116 @@ class BallGame:
         self.inventory_color = (100, 255, 100, 100)  # Зеленая зона инвентаря
         self.ui_bg_color = (240, 240, 240)
         self.text_color = (50, 50, 50)
-        
+
+        # Статичные элементы UI рендерятся один раз; поверхности для
+        # динамических счётчиков кэшируются по значению
+        self._count_text_cache = {}
+        self._count_text_cache_limit = 128
+        self._build_static_ui()
+
+        # Dirty-rect отрисовка: помним прямоугольники шариков прошлого
+        # кадра и обновляем на экране только изменившиеся области
+        self._prev_rects = []
+        self._force_full_redraw = True
+
         # Инициализация игры
         self.initialize_game()
     
+    def _build_static_ui(self):
+        """Один раз отрисовать статичные элементы UI в поверхности"""
+        ui_height = 100
+
+        # Нижняя панель с разделительной линией
+        self._ui_panel = pygame.Surface((self.width, ui_height))
+        self._ui_panel.fill(self.ui_bg_color)
+        pygame.draw.line(self._ui_panel, (200, 200, 200), (0, 0), (self.width, 0), 2)
+        self._ui_panel = self._ui_panel.convert()
+
+        # Зона удаления (красная полоса внизу) с подписью
+        delete_zone = self.game_logic.get_delete_zone_info()
+        zone_surf = pygame.Surface((delete_zone['width'], delete_zone['height']))
+        zone_surf.fill((255, 100, 100))
+        pygame.draw.rect(zone_surf, (200, 50, 50), zone_surf.get_rect(), 3)
+        delete_text = self.font.render("ЗОНА УДАЛЕНИЯ", True, (255, 255, 255))
+        zone_surf.blit(delete_text, delete_text.get_rect(center=zone_surf.get_rect().center))
+        self._delete_zone_surf = zone_surf.convert()
+
+        # Круг инвентаря (правый верхний угол) с подписью
+        inventory_radius = 30
+        inv_text = self.font.render("ИНВЕНТАРЬ", True, (0, 100, 0))
+        inv_w = max(2 * inventory_radius, inv_text.get_width())
+        inv_h = inventory_radius + 40 + inv_text.get_height() // 2 + 1
+        inv_surf = pygame.Surface((inv_w, inv_h), pygame.SRCALPHA)
+        center_x = inv_w // 2
+        pygame.draw.circle(inv_surf, (100, 255, 100), (center_x, inventory_radius), inventory_radius)
+        pygame.draw.circle(inv_surf, (50, 200, 50), (center_x, inventory_radius), inventory_radius, 3)
+        inv_surf.blit(inv_text, inv_text.get_rect(center=(center_x, inventory_radius + 40)))
+        self._inventory_surf = inv_surf.convert_alpha()
+        # Позиция так, чтобы центр круга совпал с прежним (width-80, 20)
+        self._inventory_surf_pos = (self.width - 80 - center_x, 20 - inventory_radius)
+
+        # Управление
+        controls_text = [
+            "УПРАВЛЕНИЕ:",
+            "ЛКМ - захватить/отпустить шарик",
+            "R - перезапуск",
+            "ПРОБЕЛ - добавить шарик",
+            "ESC - выход"
+        ]
+        self._controls_surfs = [
+            (self.big_font if i == 0 else self.font).render(
+                text, True, self.text_color if i == 0 else (100, 100, 100))
+            for i, text in enumerate(controls_text)
+        ]
+
+        # Таблица слотов инвентаря (4 в ряд) и точки качества трёх цветов
+        inventory_x = self.width - 80
+        inventory_y = 20
+        self._inv_slots = [(inventory_x - 60 + (i % 4) * 30, inventory_y + 80 + (i // 4) * 40)
+                           for i in range(64)]
+        self._quality_dot_surfs = {}
+        for dot_color in ((0, 255, 0), (255, 255, 0), (255, 0, 0)):
+            dot = pygame.Surface((7, 7), pygame.SRCALPHA)
+            pygame.draw.circle(dot, dot_color, (3, 3), 3)
+            self._quality_dot_surfs[dot_color] = dot.convert_alpha()
+
+        # Области UI, перерисовываемые каждый кадр: нижняя панель, зона
+        # удаления и правая колонка с инвентарём и его шариками.
+        # Колонка рисуется alpha-поверхностями без сплошного фона, поэтому
+        # в инкрементальном кадре её нужно стирать фоном отдельно — иначе
+        # тени и текст накапливаются поверх пикселей прошлого кадра
+        ui_y = self.height - ui_height
+        self._inventory_column_rect = pygame.Rect(self.width - 180, 0, 180, ui_y)
+        self._ui_dirty_rects = [
+            pygame.Rect(0, ui_y, self.width, ui_height),
+            pygame.Rect(0, self.game_logic.delete_zone_y,
+                        self.width, self.game_logic.delete_zone_height),
+            self._inventory_column_rect,
+        ]
+
+    def _count_text(self, prefix, count):
+        """Поверхность счётчика из кэша по значению"""
+        key = (prefix, count)
+        surf = self._count_text_cache.get(key)
+        if surf is None:
+            if len(self._count_text_cache) >= self._count_text_cache_limit:
+                self._count_text_cache.pop(next(iter(self._count_text_cache)))
+            surf = self.font.render(f"{prefix}{count}", True, self.text_color)
+            self._count_text_cache[key] = surf
+        return surf
+
     def initialize_game(self):
         """Инициализация игры с начальными шариками"""
         # Очищаем существующие шарики
         self.game_logic.clear_all_balls()
-        
-        # Добавляем начальные шарики
-        for i in range(self.initial_balls):
-            x = self.width // 2 + (i - self.initial_balls // 2) * 60
-            y = 150 + (i % 3) * 80
-            self.game_logic.add_ball(x, y, radius=random.uniform(18, 25))
+        self._force_full_redraw = True
+
+        # Добавляем начальные шарики одним пакетом
+        i = np.arange(self.initial_balls)
+        xs = self.width // 2 + (i - self.initial_balls // 2) * 60
+        ys = 150 + (i % 3) * 80
+        radii = self._rng.uniform(18, 25, self.initial_balls)
+        self.game_logic.bulk_add(xs, ys, radii)
     
     def handle_events(self):
         """Обработка событий"""
@@ -107,108 +219,107 @@ class BallGame:
             mouse_x, mouse_y = pos
             self.game_logic.drag_ball(mouse_x, mouse_y)
     
-    def draw_ball(self, ball):
-        """Отрисовка шарика"""
-        x, y = int(ball.x), int(ball.y)
-        radius = int(ball.radius)
-        color = (ball.color.r, ball.color.g, ball.color.b)
-        
-        # Рисуем тень
-        shadow_offset = 3
-        pygame.draw.circle(self.screen, (100, 100, 100, 50), 
-                         (x + shadow_offset, y + shadow_offset), radius)
-        
-        # Рисуем основной шарик
-        pygame.draw.circle(self.screen, color, (x, y), radius)
-        
-        # Рисуем обводку
-        pygame.draw.circle(self.screen, (0, 0, 0), (x, y), radius, 2)
-        
-        # Если шарик перетаскивается, добавляем эффект
-        if ball.state == BallState.BEING_DRAGGED:
-            # Пульсирующий эффект
-            pulse_radius = int(radius * (1.2 + 0.1 * math.sin(pygame.time.get_ticks() * 0.01)))
-            pygame.draw.circle(self.screen, (255, 255, 255, 100), (x, y), pulse_radius, 3)
+    def get_ball_surface(self, radius, color):
+        """Получить готовую поверхность шарика из кэша (или отрисовать)"""
+        r, g, b = color
+        # Квантуем цвет до 16 уровней на канал, чтобы близкие оттенки
+        # делили одну поверхность
+        key = (radius, ((r & 0xF0) << 16) | ((g & 0xF0) << 8) | (b & 0xF0))
+
+        surf = self._ball_surf_cache.get(key)
+        if surf is None:
+            # Ограничиваем кэш простым FIFO-вытеснением
+            if len(self._ball_surf_cache) >= self._ball_surf_cache_limit:
+                self._ball_surf_cache.pop(next(iter(self._ball_surf_cache)))
+
+            # Поле 2r+8 вмещает шарик вместе со сдвинутой тенью
+            size = 2 * radius + 8
+            center = radius + 4
+            surf = pygame.Surface((size, size), pygame.SRCALPHA)
+
+            # Рисуем тень
+            shadow_offset = 3
+            pygame.draw.circle(surf, (100, 100, 100, 50),
+                               (center + shadow_offset, center + shadow_offset), radius)
+
+            # Рисуем основной шарик
+            pygame.draw.circle(surf, color, (center, center), radius)
+
+            # Рисуем обводку
+            pygame.draw.circle(surf, (0, 0, 0), (center, center), radius, 2)
+
+            surf = surf.convert_alpha()
+            self._ball_surf_cache[key] = surf
+
+        return surf
+
+    def draw_balls(self):
+        """Отрисовка всех шариков одним batch-вызовом blits.
+
+        Возвращает список прямоугольников, занятых шариками в этом
+        кадре, для dirty-rect обновления экрана.
+        """
+        blit_list = []
+        rects = []
+        for ball in self.game_logic.balls:
+            radius = int(ball.radius)
+            surf = self.get_ball_surface(radius, unpack_color(ball.color))
+            dest = (int(ball.x) - radius - 4, int(ball.y) - radius - 4)
+            blit_list.append((surf, dest))
+            rects.append(pygame.Rect(dest, (2 * radius + 8, 2 * radius + 8)))
+
+        self.screen.blits(blit_list, doreturn=False)
+
+        # Пульсирующий эффект перетаскиваемого шарика рисуем отдельно
+        # поверх: его радиус меняется каждый кадр и в кэш не попадает
+        ball = self.game_logic.dragged_ball
+        if ball is not None and ball.state == BallState.BEING_DRAGGED:
+            pulse_radius = int(ball.radius * self._pulse_scale)
+            x, y = int(ball.x), int(ball.y)
+            pygame.draw.circle(self.screen, (255, 255, 255, 100),
+                               (x, y), pulse_radius, 3)
+            pulse_size = 2 * pulse_radius + 2
+            rects.append(pygame.Rect(x - pulse_radius - 1, y - pulse_radius - 1,
+                                     pulse_size, pulse_size))
+
+        return rects
     
     def draw_ui(self):
         """Отрисовка пользовательского интерфейса"""
         ui_height = 100
         ui_y = self.height - ui_height
-        
-        # Фон UI
-        pygame.draw.rect(self.screen, self.ui_bg_color, (0, ui_y, self.width, ui_height))
-        pygame.draw.line(self.screen, (200, 200, 200), (0, ui_y), (self.width, ui_y), 2)
-        
-        # Зона удаления (красная полоса внизу)
-        delete_zone = self.game_logic.get_delete_zone_info()
-        delete_rect = pygame.Rect(0, delete_zone['y'], delete_zone['width'], delete_zone['height'])
-        pygame.draw.rect(self.screen, (255, 100, 100, 150), delete_rect)
-        pygame.draw.rect(self.screen, (200, 50, 50), delete_rect, 3)
-        
-        # Текст зоны удаления
-        delete_text = self.font.render("ЗОНА УДАЛЕНИЯ", True, (255, 255, 255))
-        text_rect = delete_text.get_rect(center=(self.width // 2, delete_zone['y'] + delete_zone['height'] // 2))
-        self.screen.blit(delete_text, text_rect)
-        
-        # Инвентарь (правый верхний угол)
+
+        # Статика: фон UI, зона удаления, инвентарь, подсказки управления
+        self.screen.blit(self._ui_panel, (0, ui_y))
+        self.screen.blit(self._delete_zone_surf, (0, self.game_logic.delete_zone_y))
+        self.screen.blit(self._inventory_surf, self._inventory_surf_pos)
+        for i, surf in enumerate(self._controls_surfs):
+            self.screen.blit(surf, (20, ui_y + 40 + i * 20))
+
+        # Динамические счётчики (перерисовываются при смене значения)
         inventory_x = self.width - 80
         inventory_y = 20
-        inventory_radius = 30
-        
-        pygame.draw.circle(self.screen, (100, 255, 100, 150), (inventory_x, inventory_y), inventory_radius)
-        pygame.draw.circle(self.screen, (50, 200, 50), (inventory_x, inventory_y), inventory_radius, 3)
-        
-        # Текст инвентаря
-        inv_text = self.font.render("ИНВЕНТАРЬ", True, (0, 100, 0))
-        inv_rect = inv_text.get_rect(center=(inventory_x, inventory_y + 40))
-        self.screen.blit(inv_text, inv_rect)
-        
-        # Информация о шариках в инвентаре
-        inventory_info = self.game_logic.get_inventory_info()
-        inv_count_text = self.font.render(f"Шариков: {len(inventory_info)}", True, self.text_color)
-        self.screen.blit(inv_count_text, (inventory_x - 50, inventory_y + 60))
-        
-        # Информация о шариках в игре
-        balls_info = self.game_logic.get_balls_info()
-        game_balls_text = self.font.render(f"В игре: {len(balls_info)}", True, self.text_color)
-        self.screen.blit(game_balls_text, (20, ui_y + 20))
-        
-        # Управление
-        controls_text = [
-            "УПРАВЛЕНИЕ:",
-            "ЛКМ - захватить/отпустить шарик",
-            "R - перезапуск",
-            "ПРОБЕЛ - добавить шарик",
-            "ESC - выход"
-        ]
-        
-        for i, text in enumerate(controls_text):
-            color = self.text_color if i == 0 else (100, 100, 100)
-            font = self.big_font if i == 0 else self.font
-            rendered_text = font.render(text, True, color)
-            self.screen.blit(rendered_text, (20, ui_y + 40 + i * 20))
+        self.screen.blit(self._count_text("Шариков: ", len(self.game_logic.inventory)),
+                         (inventory_x - 50, inventory_y + 60))
+        self.screen.blit(self._count_text("В игре: ", len(self.game_logic.balls)),
+                         (20, ui_y + 20))
     
     def draw_inventory_balls(self):
         """Отрисовка шариков в инвентаре"""
-        inventory_info = self.game_logic.get_inventory_info()
-        inventory_x = self.width - 80
-        inventory_y = 20
-        
-        for i, ball_info in enumerate(inventory_info):
-            # Размещаем шарики в ряд под инвентарем
-            ball_x = inventory_x - 60 + (i % 4) * 30
-            ball_y = inventory_y + 80 + (i // 4) * 40
-            
-            color = ball_info['color']
-            radius = int(ball_info['radius'] * 0.7)  # Уменьшенные шарики в инвентаре
-            
-            pygame.draw.circle(self.screen, color, (ball_x, ball_y), radius)
-            pygame.draw.circle(self.screen, (0, 0, 0), (ball_x, ball_y), radius, 1)
-            
+        blit_list = []
+
+        # Слоты предвычислены, шарики берутся из общего кэша поверхностей
+        for ball, (ball_x, ball_y) in zip(self.game_logic.inventory, self._inv_slots):
+            radius = int(ball.radius * 0.7)  # Уменьшенные шарики в инвентаре
+            surf = self.get_ball_surface(radius, unpack_color(ball.color))
+            blit_list.append((surf, (ball_x - radius - 4, ball_y - radius - 4)))
+
             # Показываем качество шарика
-            quality = ball_info['quality']
+            quality = self.game_logic.get_ball_quality_score(ball)
             quality_color = (0, 255, 0) if quality > 0.7 else (255, 255, 0) if quality > 0.4 else (255, 0, 0)
-            pygame.draw.circle(self.screen, quality_color, (ball_x, ball_y), 3)
+            blit_list.append((self._quality_dot_surfs[quality_color], (ball_x - 3, ball_y - 3)))
+
+        self.screen.blits(blit_list, doreturn=False)
     
     def run(self):
         """Основной игровой цикл"""
@@ -221,26 +332,41 @@ class BallGame:
             # Обновление логики игры
             self.game_logic.update(1.0 / self.fps)
             
-            # Отрисовка
-            self.screen.fill(self.bg_color)
-            
+            # Пульсация одинакова для всего кадра — считаем один раз
+            self._pulse_scale = 1.2 + 0.1 * math.sin(pygame.time.get_ticks() * 0.01)
+
+            # Отрисовка: полная перерисовка после рестарта, иначе
+            # стираем фоном только прошлые позиции шариков
+            full_redraw = self._force_full_redraw
+            if full_redraw:
+                self.screen.fill(self.bg_color)
+                self._force_full_redraw = False
+            else:
+                for rect in self._prev_rects:
+                    self.screen.fill(self.bg_color, rect)
+                # Колонка инвентаря состоит из alpha-блитов — без
+                # стирания они компонуются со своим прошлым кадром
+                self.screen.fill(self.bg_color, self._inventory_column_rect)
+
             # Рисуем шарики
-            for ball in self.game_logic.balls:
-                self.draw_ball(ball)
-            
+            new_rects = self.draw_balls()
+
             # Рисуем UI
             self.draw_ui()
             self.draw_inventory_balls()
-            
-            # Обновление экрана
-            pygame.display.flip()
+
+            # Обновление экрана: только изменившиеся области
+            if full_redraw:
+                pygame.display.flip()
+            else:
+                pygame.display.update(self._prev_rects + new_rects + self._ui_dirty_rects)
+            self._prev_rects = new_rects
             self.clock.tick(self.fps)
         
         pygame.quit()
         sys.exit()
 
 if __name__ == "__main__":
-    import random
     game = BallGame()
     game.run()
 
@@ -1,9 +1,12 @@
+import itertools
 import math
 import random
 from typing import List, Tuple, Optional, Dict
-from dataclasses import dataclass
 from enum import Enum
 
+import numpy as np
+from numba import njit
+
 
 class BallState(Enum):
     """Состояния шарика"""
@@ -12,258 +15,433 @@ class BallState(Enum):
     BEING_DRAGGED = "being_dragged"  # Перетаскивается мышкой
 
 
-@dataclass
-class Color:
-    """Представление цвета шарика"""
-    r: int
-    g: int
-    b: int
-    
-    def __post_init__(self):
-        # Ограничиваем значения от 0 до 255
-        self.r = max(0, min(255, self.r))
-        self.g = max(0, min(255, self.g))
-        self.b = max(0, min(255, self.b))
-    
-    def mix_with(self, other: 'Color') -> 'Color':
-        """Математическое смешивание цветов через усреднение RGB-значений"""
-        return Color(
-            r=int((self.r + other.r) / 2),
-            g=int((self.g + other.g) / 2),
-            b=int((self.b + other.b) / 2)
-        )
-    
-    def get_brightness(self) -> float:
-        """Получить яркость цвета (0-1)"""
-        return (self.r + self.g + self.b) / (3 * 255)
-    
-    def is_white(self) -> bool:
-        """Проверка, является ли цвет белым"""
-        return self.r > 200 and self.g > 200 and self.b > 200
-    
-    def get_saturation(self) -> float:
-        """Получить насыщенность цвета (0-1)"""
-        max_component = max(self.r, self.g, self.b)
-        min_component = min(self.r, self.g, self.b)
-        return (max_component - min_component) / 255 if max_component > 0 else 0
-    
-    def get_hue(self) -> float:
-        """Получить оттенок цвета в градусах (0-360)"""
-        r, g, b = self.r / 255.0, self.g / 255.0, self.b / 255.0
-        max_val = max(r, g, b)
-        min_val = min(r, g, b)
-        diff = max_val - min_val
-        
-        if diff == 0:
-            return 0  # Серый цвет
-        
-        if max_val == r:
-            hue = 60 * ((g - b) / diff)
-        elif max_val == g:
-            hue = 60 * (2 + (b - r) / diff)
-        else:  # max_val == b
-            hue = 60 * (4 + (r - g) / diff)
-        
-        return (hue + 360) % 360
-
-
-@dataclass
+# Числовые коды состояний для хранения в массивах
+_STATE_FREE = 0
+_STATE_IN_INVENTORY = 1
+_STATE_BEING_DRAGGED = 2
+
+_STATE_CODES = {
+    BallState.FREE: _STATE_FREE,
+    BallState.IN_INVENTORY: _STATE_IN_INVENTORY,
+    BallState.BEING_DRAGGED: _STATE_BEING_DRAGGED,
+}
+
+_STATES_BY_CODE = (BallState.FREE, BallState.IN_INVENTORY, BallState.BEING_DRAGGED)
+
+
+@njit("void(f8[:, ::1], f8[:, ::1], f8[::1], u4[::1], i1[::1], f8, f8, f8, f8, i4, i4)",
+      cache=True, fastmath=True, boundscheck=False)
+def _step(pos, vel, radius, rgb, state, dt, gravity, friction, bounce,
+          width, height):
+    """Один шаг физики: интегрирование, столкновения и границы экрана.
+
+    Скомпилированное numba-ядро работает напрямую с SoA-массивами и
+    объединяет все три фазы в один проход без участия интерпретатора.
+    Явная сигнатура заставляет компиляцию при импорте (с кэшем на диске),
+    поэтому первый кадр не платит за JIT.
+
+    Столкновения ищутся через равномерную сетку с ячейкой 2*max(radius):
+    каждый шарик сравнивается только с соседями из своей ячейки и восьми
+    смежных, что снимает полный O(N^2) перебор пар. Сетка хранится в
+    CSR-виде (cell_start + sorted_idx), удобном для nopython-кода.
+    """
+    n = pos.shape[0]
+
+    # Интегрирование: гравитация, позиция, трение
+    for i in range(n):
+        if state[i] != _STATE_FREE:
+            continue
+        vel[i, 1] += gravity * dt
+        pos[i, 0] += vel[i, 0] * dt
+        pos[i, 1] += vel[i, 1] * dt
+        vel[i, 0] *= friction
+        vel[i, 1] *= friction
+
+    # Строим сетку: ячейка 2*max(radius) гарантирует, что касающиеся
+    # шарики лежат не дальше соседних ячеек
+    max_radius = 0.0
+    for i in range(n):
+        if radius[i] > max_radius:
+            max_radius = radius[i]
+    cell_size = 2.0 * max_radius
+
+    if cell_size > 0.0:
+        grid_w = int(width / cell_size) + 1
+        grid_h = int(height / cell_size) + 1
+        num_cells = grid_w * grid_h
+
+        # CSR-раскладка: cell_of[i] — ячейка шарика, cell_start[c] —
+        # начало списка ячейки c в sorted_idx (counting sort)
+        cell_of = np.full(n, -1, dtype=np.int32)
+        cell_start = np.zeros(num_cells + 1, dtype=np.int32)
+        for i in range(n):
+            if state[i] != _STATE_FREE:
+                continue
+            cx = int(pos[i, 0] / cell_size)
+            cy = int(pos[i, 1] / cell_size)
+            cx = min(max(cx, 0), grid_w - 1)
+            cy = min(max(cy, 0), grid_h - 1)
+            cell_of[i] = cy * grid_w + cx
+            cell_start[cell_of[i] + 1] += 1
+        for c in range(num_cells):
+            cell_start[c + 1] += cell_start[c]
+        sorted_idx = np.empty(cell_start[num_cells], dtype=np.int32)
+        cursor = cell_start[:-1].copy()
+        for i in range(n):
+            c = cell_of[i]
+            if c >= 0:
+                sorted_idx[cursor[c]] = i
+                cursor[c] += 1
+
+        # Столкновения: шарик против своей ячейки и восьми соседних,
+        # каждая пара проверяется один раз (j > i)
+        for i in range(n):
+            if state[i] != _STATE_FREE:
+                continue
+            cx = cell_of[i] % grid_w
+            cy = cell_of[i] // grid_w
+            for ncy in range(cy - 1, cy + 2):
+                if ncy < 0 or ncy >= grid_h:
+                    continue
+                for ncx in range(cx - 1, cx + 2):
+                    if ncx < 0 or ncx >= grid_w:
+                        continue
+                    c = ncy * grid_w + ncx
+                    for s in range(cell_start[c], cell_start[c + 1]):
+                        j = sorted_idx[s]
+                        if j <= i:
+                            continue
+                        dx = pos[i, 0] - pos[j, 0]
+                        dy = pos[i, 1] - pos[j, 1]
+                        d2 = dx * dx + dy * dy
+                        rsum = radius[i] + radius[j]
+                        if d2 < rsum * rsum and d2 > 0.0:
+                            # Шарики касаются - смешиваем цвета
+                            # SWAR-усреднением упакованных значений
+                            mixed = ((rgb[i] & 0xFEFEFE) + (rgb[j] & 0xFEFEFE)) >> 1
+                            rgb[i] = mixed
+                            rgb[j] = mixed
+
+                            # Разделяем шарики, чтобы они не застряли
+                            inv_d = 1.0 / math.sqrt(d2)
+                            overlap = rsum - d2 * inv_d
+                            separation_x = dx * inv_d * overlap * 0.5
+                            separation_y = dy * inv_d * overlap * 0.5
+                            pos[i, 0] += separation_x
+                            pos[i, 1] += separation_y
+                            pos[j, 0] -= separation_x
+                            pos[j, 1] -= separation_y
+
+    # Отскок от границ экрана
+    for i in range(n):
+        if state[i] != _STATE_FREE:
+            continue
+        r = radius[i]
+        if pos[i, 0] - r < 0:
+            pos[i, 0] = r
+            vel[i, 0] = abs(vel[i, 0]) * bounce
+        elif pos[i, 0] + r > width:
+            pos[i, 0] = width - r
+            vel[i, 0] = -abs(vel[i, 0]) * bounce
+        if pos[i, 1] - r < 0:
+            pos[i, 1] = r
+            vel[i, 1] = abs(vel[i, 1]) * bounce
+        elif pos[i, 1] + r > height:
+            pos[i, 1] = height - r
+            vel[i, 1] = -abs(vel[i, 1]) * bounce
+
+
+# Цвет хранится упакованным в uint32 (0xRRGGBB): без объектов на куче,
+# смешивание и распаковка — чистая битовая арифметика
+
+def pack_color(r: int, g: int, b: int) -> int:
+    """Упаковать RGB-компоненты (0-255) в uint32 0xRRGGBB"""
+    return (max(0, min(255, r)) << 16) | (max(0, min(255, g)) << 8) | max(0, min(255, b))
+
+
+def unpack_color(color: int) -> Tuple[int, int, int]:
+    """Распаковать uint32-цвет в кортеж (r, g, b)"""
+    return (color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF
+
+
+def mix_colors(color1: int, color2: int) -> int:
+    """Математическое смешивание цветов через усреднение RGB-значений.
+
+    SWAR-усреднение: маска 0xFEFEFE сбрасывает младший бит каждого
+    канала, поэтому сдвиг суммы не переносит биты между каналами.
+    """
+    return ((color1 & 0xFEFEFE) + (color2 & 0xFEFEFE)) >> 1
+
+
 class Ball:
-    """Класс шарика"""
-    x: float
-    y: float
-    vx: float  # Скорость по X
-    vy: float  # Скорость по Y
-    radius: float
-    color: Color
-    state: BallState = BallState.FREE
-    id: int = 0
-    
-    def __post_init__(self):
-        if self.id == 0:
-            self.id = random.randint(1000, 9999)
+    """Шарик — лёгкое представление одной строки SoA-массивов GameLogic.
+
+    Состояние хранится не в объекте, а в numpy-массивах GameLogic
+    (Structure-of-Arrays), поэтому объект держит только ссылку на логику
+    и индекс своей строки. Атрибуты читаются и пишутся напрямую в массивы.
+    """
+
+    __slots__ = ('_logic', '_index')
+
+    def __init__(self, logic: 'GameLogic', index: int):
+        self._logic = logic
+        self._index = index
+
+    @property
+    def x(self) -> float:
+        return float(self._logic.pos[self._index, 0])
+
+    @x.setter
+    def x(self, value: float):
+        self._logic.pos[self._index, 0] = value
+
+    @property
+    def y(self) -> float:
+        return float(self._logic.pos[self._index, 1])
+
+    @y.setter
+    def y(self, value: float):
+        self._logic.pos[self._index, 1] = value
+
+    @property
+    def vx(self) -> float:
+        return float(self._logic.vel[self._index, 0])
+
+    @vx.setter
+    def vx(self, value: float):
+        self._logic.vel[self._index, 0] = value
+
+    @property
+    def vy(self) -> float:
+        return float(self._logic.vel[self._index, 1])
+
+    @vy.setter
+    def vy(self, value: float):
+        self._logic.vel[self._index, 1] = value
+
+    @property
+    def radius(self) -> float:
+        return float(self._logic.radius[self._index])
+
+    @radius.setter
+    def radius(self, value: float):
+        self._logic.radius[self._index] = value
+
+    @property
+    def color(self) -> int:
+        return int(self._logic.rgb[self._index])
+
+    @color.setter
+    def color(self, value: int):
+        self._logic.rgb[self._index] = value
+
+    @property
+    def state(self) -> BallState:
+        return _STATES_BY_CODE[self._logic.state[self._index]]
+
+    @state.setter
+    def state(self, value: BallState):
+        self._logic.state[self._index] = _STATE_CODES[value]
+
+    @property
+    def id(self) -> int:
+        return int(self._logic.ids[self._index])
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, Ball)
+                and other._logic is self._logic
+                and other._index == self._index)
 
 
 class GameLogic:
     """Основной класс логики игры"""
-    
+
     def __init__(self, screen_width: int = 800, screen_height: int = 600):
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self.balls: List[Ball] = []
-        self.inventory: List[Ball] = []
+
+        # Состояние шариков в виде Structure-of-Arrays: одна строка — один
+        # шарик. Векторизованные numpy-операции обрабатывают все шарики
+        # разом, без Python-цикла по объектам.
+        self.pos = np.empty((0, 2), dtype=np.float64)  # x, y
+        self.vel = np.empty((0, 2), dtype=np.float64)  # vx, vy
+        self.radius = np.empty(0, dtype=np.float64)
+        self.rgb = np.empty(0, dtype=np.uint32)
+        self.state = np.empty(0, dtype=np.int8)
+        self.ids = np.empty(0, dtype=np.int64)
+
+        # Индексы строк, лежащих в инвентаре (в порядке добавления)
+        self._inventory_indices: List[int] = []
+
+        # Монотонный счётчик id: уникальность гарантирована, без обращений
+        # к генератору случайных чисел при каждом создании шарика
+        self._next_id = itertools.count(1)
+
         self.dragged_ball: Optional[Ball] = None
         self.drag_offset_x = 0
         self.drag_offset_y = 0
-        
+
         # Зона удаления (внизу экрана)
         self.delete_zone_y = screen_height - 50
         self.delete_zone_height = 50
-        
+
         # Физические константы
         self.friction = 0.98  # Трение
         self.bounce_damping = 0.8  # Затухание при отскоке
         self.gravity = 0.2  # Гравитация
-        
+
         # Настройки для генерации случайных цветов
         self.min_color_value = 50   # Минимальное значение RGB компонента
         self.max_color_value = 255  # Максимальное значение RGB компонента
-    
+
+        # Генератор для пакетной выборки цветов
+        self._rng = np.random.default_rng()
+
+        # Кэш оценок качества: оценка — чистая функция упакованного
+        # цвета, а цвета при смешивании сходятся, поэтому кэш остаётся
+        # маленьким и не требует инвалидации
+        self._quality_cache: Dict[int, float] = {}
+
+    @property
+    def balls(self) -> List[Ball]:
+        """Шарики, находящиеся в игре (не в инвентаре)"""
+        return [Ball(self, i) for i in range(len(self.state))
+                if self.state[i] != _STATE_IN_INVENTORY]
+
+    @property
+    def inventory(self) -> List[Ball]:
+        """Шарики в инвентаре (в порядке добавления)"""
+        return [Ball(self, i) for i in self._inventory_indices]
+
     def add_ball(self, x: float, y: float, radius: float = 20) -> Ball:
         """Добавить новый шарик в игру"""
         # Генерируем случайный цвет с хорошей яркостью
         color = self.generate_random_color(min_brightness=0.4, max_brightness=0.9)
-        
-        ball = Ball(
-            x=x, y=y,
-            vx=random.uniform(-3, 3),
-            vy=random.uniform(-3, 3),
-            radius=radius,
-            color=color
-        )
-        
-        self.balls.append(ball)
-        return ball
-    
-    def generate_random_color(self, min_brightness: float = 0.3, max_brightness: float = 1.0) -> Color:
-        """Генерировать случайный цвет с заданными характеристиками"""
-        # Генерируем случайные RGB компоненты
-        r = random.randint(self.min_color_value, self.max_color_value)
-        g = random.randint(self.min_color_value, self.max_color_value)
-        b = random.randint(self.min_color_value, self.max_color_value)
-        
-        color = Color(r, g, b)
-        
-        # Корректируем яркость если нужно
-        current_brightness = color.get_brightness()
-        if current_brightness < min_brightness or current_brightness > max_brightness:
-            target_brightness = random.uniform(min_brightness, max_brightness)
-            scale_factor = target_brightness / current_brightness
-            
-            new_r = int(color.r * scale_factor)
-            new_g = int(color.g * scale_factor)
-            new_b = int(color.b * scale_factor)
-            
-            color = Color(new_r, new_g, new_b)
-        
-        return color
-    
+
+        self.pos = np.concatenate([self.pos, [[x, y]]])
+        self.vel = np.concatenate([self.vel, [[random.uniform(-3, 3),
+                                               random.uniform(-3, 3)]]])
+        self.radius = np.concatenate([self.radius, [radius]])
+        self.rgb = np.concatenate([self.rgb,
+                                   np.array([color], dtype=np.uint32)])
+        self.state = np.concatenate([self.state,
+                                     np.array([_STATE_FREE], dtype=np.int8)])
+        self.ids = np.concatenate([self.ids, [next(self._next_id)]])
+
+        return Ball(self, len(self.state) - 1)
+
+    def bulk_add(self, xs, ys, radii, colors=None) -> List[Ball]:
+        """Добавить пакет шариков одним присваиванием в SoA-массивы.
+
+        Позиции, радиусы и цвета записываются блоком, скорости всего
+        пакета выбираются одним вызовом генератора — вместо N итераций
+        add_ball. Если colors не переданы, они генерируются пакетно.
+        """
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        count = len(xs)
+
+        if colors is None:
+            colors = self.generate_random_colors(count, min_brightness=0.4,
+                                                 max_brightness=0.9)
+
+        first = len(self.state)
+        self.pos = np.concatenate([self.pos, np.stack([xs, ys], axis=1)])
+        self.vel = np.concatenate([self.vel, self._rng.uniform(-3, 3, (count, 2))])
+        self.radius = np.concatenate([self.radius,
+                                      np.asarray(radii, dtype=np.float64)])
+        self.rgb = np.concatenate([self.rgb, np.asarray(colors, dtype=np.uint32)])
+        self.state = np.concatenate([self.state, np.zeros(count, dtype=np.int8)])
+        self.ids = np.concatenate([self.ids,
+                                   [next(self._next_id) for _ in range(count)]])
+
+        return [Ball(self, first + i) for i in range(count)]
+
+    def generate_random_color(self, min_brightness: float = 0.3, max_brightness: float = 1.0) -> int:
+        """Генерировать случайный упакованный цвет с заданными характеристиками"""
+        return int(self.generate_random_colors(1, min_brightness, max_brightness)[0])
+
+    def generate_random_colors(self, count: int, min_brightness: float = 0.3,
+                               max_brightness: float = 1.0) -> np.ndarray:
+        """Сгенерировать массив случайных упакованных цветов одним проходом.
+
+        Все RGB-компоненты выбираются одним вызовом генератора, а строки
+        с яркостью вне [min_brightness, max_brightness] масштабируются
+        векторизованно — вместо трёх RNG-вызовов и поканального клампа
+        на каждый шарик.
+        """
+        rgb = self._rng.integers(self.min_color_value, self.max_color_value + 1,
+                                 size=(count, 3))
+
+        # Корректируем яркость строк, выпавших за допустимый диапазон
+        brightness = rgb.sum(axis=1) / (3 * 255)
+        out_of_range = (brightness < min_brightness) | (brightness > max_brightness)
+        if out_of_range.any():
+            target = self._rng.uniform(min_brightness, max_brightness,
+                                       int(out_of_range.sum()))
+            scale = target / brightness[out_of_range]
+            rgb[out_of_range] = np.minimum(
+                (rgb[out_of_range] * scale[:, None]).astype(np.int64), 255)
+
+        return ((rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2]).astype(np.uint32)
+
     def update(self, dt: float = 1.0):
         """Обновление логики игры"""
-        # Обновляем свободные шарики
-        for ball in self.balls:
-            if ball.state == BallState.FREE:
-                self._update_ball_physics(ball, dt)
-                self._check_collisions(ball)
-                self._check_boundaries(ball)
-        
+        # Один вызов скомпилированного ядра обрабатывает все свободные
+        # шарики: физика, столкновения со смешиванием цветов и границы
+        _step(self.pos, self.vel, self.radius, self.rgb, self.state,
+              dt, self.gravity, self.friction, self.bounce_damping,
+              self.screen_width, self.screen_height)
+
         # Обновляем перетаскиваемый шарик
         if self.dragged_ball and self.dragged_ball.state == BallState.BEING_DRAGGED:
             # Позиция обновляется в методе drag_ball
             pass
-    
-    def _update_ball_physics(self, ball: Ball, dt: float):
-        """Обновление физики шарика"""
-        # Применяем гравитацию
-        ball.vy += self.gravity * dt
-        
-        # Обновляем позицию
-        ball.x += ball.vx * dt
-        ball.y += ball.vy * dt
-        
-        # Применяем трение
-        ball.vx *= self.friction
-        ball.vy *= self.friction
-    
-    def _check_collisions(self, ball: Ball):
-        """Проверка столкновений между шариками"""
-        for other in self.balls:
-            if other == ball or other.state != BallState.FREE:
-                continue
-            
-            distance = math.sqrt((ball.x - other.x)**2 + (ball.y - other.y)**2)
-            min_distance = ball.radius + other.radius
-            
-            if distance < min_distance and distance > 0:
-                # Шарики касаются - смешиваем цвета
-                self._mix_ball_colors(ball, other)
-                
-                # Разделяем шарики, чтобы они не застряли
-                overlap = min_distance - distance
-                separation_x = (ball.x - other.x) / distance * overlap * 0.5
-                separation_y = (ball.y - other.y) / distance * overlap * 0.5
-                
-                ball.x += separation_x
-                ball.y += separation_y
-                other.x -= separation_x
-                other.y -= separation_y
-    
-    def _mix_ball_colors(self, ball1: Ball, ball2: Ball):
-        """Математическое смешивание цветов при касании шариков"""
-        # Смешиваем цвета через усреднение RGB-значений
-        mixed_color = ball1.color.mix_with(ball2.color)
-        
-        # Оба шарика получают одинаковый смешанный цвет
-        ball1.color = mixed_color
-        ball2.color = mixed_color
-    
-    def _check_boundaries(self, ball: Ball):
-        """Проверка границ экрана"""
-        # Отскок от стен
-        if ball.x - ball.radius < 0:
-            ball.x = ball.radius
-            ball.vx = abs(ball.vx) * self.bounce_damping
-        elif ball.x + ball.radius > self.screen_width:
-            ball.x = self.screen_width - ball.radius
-            ball.vx = -abs(ball.vx) * self.bounce_damping
-        
-        if ball.y - ball.radius < 0:
-            ball.y = ball.radius
-            ball.vy = abs(ball.vy) * self.bounce_damping
-        elif ball.y + ball.radius > self.screen_height:
-            ball.y = self.screen_height - ball.radius
-            ball.vy = -abs(ball.vy) * self.bounce_damping
-    
+
     def start_drag(self, mouse_x: float, mouse_y: float) -> bool:
         """Начать перетаскивание шарика мышкой"""
-        for ball in reversed(self.balls):  # Берем верхний шарик
-            if ball.state == BallState.FREE:
-                distance = math.sqrt((ball.x - mouse_x)**2 + (ball.y - mouse_y)**2)
-                if distance <= ball.radius:
-                    self.dragged_ball = ball
-                    ball.state = BallState.BEING_DRAGGED
-                    self.drag_offset_x = ball.x - mouse_x
-                    self.drag_offset_y = ball.y - mouse_y
+        for index in reversed(range(len(self.state))):  # Берем верхний шарик
+            if self.state[index] == _STATE_FREE:
+                x, y = self.pos[index]
+                # Сравниваем квадраты расстояний — сам корень не нужен
+                dx = x - mouse_x
+                dy = y - mouse_y
+                if dx * dx + dy * dy <= self.radius[index] ** 2:
+                    self.dragged_ball = Ball(self, index)
+                    self.state[index] = _STATE_BEING_DRAGGED
+                    self.drag_offset_x = x - mouse_x
+                    self.drag_offset_y = y - mouse_y
                     return True
         return False
-    
+
     def drag_ball(self, mouse_x: float, mouse_y: float):
         """Перетаскивание шарика мышкой"""
         if self.dragged_ball and self.dragged_ball.state == BallState.BEING_DRAGGED:
             self.dragged_ball.x = mouse_x + self.drag_offset_x
             self.dragged_ball.y = mouse_y + self.drag_offset_y
-    
+
     def end_drag(self, mouse_x: float, mouse_y: float) -> bool:
         """Завершить перетаскивание шарика"""
         if not self.dragged_ball:
             return False
-        
+
         ball = self.dragged_ball
-        
+
         # Проверяем, попал ли шарик в зону удаления
         if self._is_in_delete_zone(mouse_x, mouse_y):
             self._delete_ball(ball)
             self.dragged_ball = None
             return True
-        
+
         # Проверяем, попал ли шарик в инвентарь (например, в правый верхний угол)
         inventory_x = self.screen_width - 100
         inventory_y = 50
         inventory_radius = 30
-        
-        distance_to_inventory = math.sqrt((mouse_x - inventory_x)**2 + (mouse_y - inventory_y)**2)
-        
-        if distance_to_inventory <= inventory_radius:
+
+        dx = mouse_x - inventory_x
+        dy = mouse_y - inventory_y
+
+        if dx * dx + dy * dy <= inventory_radius ** 2:
             # Помещаем шарик в инвентарь
             self._add_to_inventory(ball)
             self.dragged_ball = None
@@ -276,78 +454,120 @@ class GameLogic:
             ball.vy = (mouse_y - ball.y) * 0.1
             self.dragged_ball = None
             return False
-    
+
     def _is_in_delete_zone(self, x: float, y: float) -> bool:
         """Проверка, находится ли точка в зоне удаления"""
         return y >= self.delete_zone_y and y <= self.delete_zone_y + self.delete_zone_height
-    
+
     def _add_to_inventory(self, ball: Ball):
         """Добавить шарик в инвентарь"""
         ball.state = BallState.IN_INVENTORY
-        self.balls.remove(ball)
-        self.inventory.append(ball)
-    
+        self._inventory_indices.append(ball._index)
+
     def _delete_ball(self, ball: Ball):
         """Удалить шарик из игры"""
-        if ball in self.balls:
-            self.balls.remove(ball)
-        if ball in self.inventory:
-            self.inventory.remove(ball)
-    
+        self._remove_at(ball._index)
+
+    def _remove_at(self, index: int):
+        """Удалить строку шарика из SoA-массивов заменой последней (swap-pop).
+
+        Вместо np.delete, копирующего все массивы целиком, последняя
+        строка переносится на место удаляемой и массивы укорачиваются
+        на единицу — удаление за O(1) без линейных сканов.
+        """
+        last = len(self.state) - 1
+
+        self._inventory_indices = [i for i in self._inventory_indices if i != index]
+        if self.dragged_ball is not None and self.dragged_ball._index == index:
+            self.dragged_ball = None
+
+        if index != last:
+            self.pos[index] = self.pos[last]
+            self.vel[index] = self.vel[last]
+            self.radius[index] = self.radius[last]
+            self.rgb[index] = self.rgb[last]
+            self.state[index] = self.state[last]
+            self.ids[index] = self.ids[last]
+
+            # Ссылки на переехавшую последнюю строку переводим на новое место
+            self._inventory_indices = [index if i == last else i
+                                       for i in self._inventory_indices]
+            if self.dragged_ball is not None and self.dragged_ball._index == last:
+                self.dragged_ball._index = index
+
+        self.pos = self.pos[:last]
+        self.vel = self.vel[:last]
+        self.radius = self.radius[:last]
+        self.rgb = self.rgb[:last]
+        self.state = self.state[:last]
+        self.ids = self.ids[:last]
+
     def eject_ball_from_inventory(self, inventory_index: int) -> bool:
         """Выплюнуть шарик из инвентаря обратно в игру"""
-        if 0 <= inventory_index < len(self.inventory):
-            ball = self.inventory.pop(inventory_index)
-            ball.state = BallState.FREE
-            
+        if 0 <= inventory_index < len(self._inventory_indices):
+            index = self._inventory_indices.pop(inventory_index)
+            self.state[index] = _STATE_FREE
+
             # Размещаем шарик в случайном месте в верхней части экрана
-            ball.x = random.uniform(50, self.screen_width - 50)
-            ball.y = random.uniform(50, 150)
-            
+            self.pos[index] = (random.uniform(50, self.screen_width - 50),
+                               random.uniform(50, 150))
+
             # Добавляем случайную скорость
-            ball.vx = random.uniform(-2, 2)
-            ball.vy = random.uniform(-2, 2)
-            
-            self.balls.append(ball)
+            self.vel[index] = (random.uniform(-2, 2), random.uniform(-2, 2))
+
             return True
         return False
-    
+
     def get_ball_quality_score(self, ball: Ball) -> float:
         """Получить оценку качества шарика (чем выше, тем лучше)"""
-        brightness = ball.color.get_brightness()
-        saturation = ball.color.get_saturation()
-        
+        color = ball.color
+        quality = self._quality_cache.get(color)
+        if quality is None:
+            if len(self._quality_cache) >= 1024:
+                self._quality_cache.pop(next(iter(self._quality_cache)))
+            quality = self._compute_quality_score(color)
+            self._quality_cache[color] = quality
+        return quality
+
+    def _compute_quality_score(self, color: int) -> float:
+        """Вычислить оценку качества для упакованного цвета"""
+        r, g, b = unpack_color(color)
+        max_component = max(r, g, b)
+        min_component = min(r, g, b)
+
+        brightness = (r + g + b) / (3 * 255)
+        saturation = (max_component - min_component) / 255 if max_component > 0 else 0
+
         # Белый цвет - плохой результат
-        if ball.color.is_white():
+        if r > 200 and g > 200 and b > 200:
             return 0.0
-        
+
         # Серый цвет (низкая насыщенность) - плохой результат
         if saturation < 0.1:
             return 0.1
-        
+
         # Оценка на основе яркости и насыщенности
         # Используем квадратичную зависимость для насыщенности (более яркие цвета ценятся выше)
         quality = brightness * (saturation ** 0.5)
-        
+
         # Дополнительный бонус за сбалансированность цветов
-        r, g, b = ball.color.r, ball.color.g, ball.color.b
-        balance = 1.0 - abs(max(r, g, b) - min(r, g, b)) / 255.0
+        balance = 1.0 - (max_component - min_component) / 255.0
         quality *= (0.7 + 0.3 * balance)  # Баланс дает небольшой бонус
-        
+
         return min(1.0, quality)
-    
+
     def get_inventory_info(self) -> List[Dict]:
         """Получить информацию об инвентаре"""
         return [
             {
                 'index': i,
-                'color': (ball.color.r, ball.color.g, ball.color.b),
+                'color': unpack_color(ball.color),
                 'quality': self.get_ball_quality_score(ball),
                 'radius': ball.radius
             }
             for i, ball in enumerate(self.inventory)
         ]
-    
+
     def get_balls_info(self) -> List[Dict]:
         """Получить информацию о всех шариках в игре"""
         return [
@@ -358,19 +578,24 @@ class GameLogic:
                 'vx': ball.vx,
                 'vy': ball.vy,
                 'radius': ball.radius,
-                'color': (ball.color.r, ball.color.g, ball.color.b),
+                'color': unpack_color(ball.color),
                 'state': ball.state.value,
                 'quality': self.get_ball_quality_score(ball)
             }
             for ball in self.balls
         ]
-    
+
     def clear_all_balls(self):
         """Очистить все шарики"""
-        self.balls.clear()
-        self.inventory.clear()
+        self.pos = np.empty((0, 2), dtype=np.float64)
+        self.vel = np.empty((0, 2), dtype=np.float64)
+        self.radius = np.empty(0, dtype=np.float64)
+        self.rgb = np.empty(0, dtype=np.uint32)
+        self.state = np.empty(0, dtype=np.int8)
+        self.ids = np.empty(0, dtype=np.int64)
+        self._inventory_indices = []
         self.dragged_ball = None
-    
+
     def get_delete_zone_info(self) -> Dict:
         """Получить информацию о зоне удаления"""
         return {
@@ -384,23 +609,25 @@ class GameLogic:
 if __name__ == "__main__":
     # Создаем игру
     game = GameLogic(800, 600)
-    
+
     # Демонстрация смешивания цветов
     print("=== Демонстрация математического смешивания цветов ===")
-    
+
     # Создаем два шарика с разными цветами
-    red_ball = Ball(100, 100, 0, 0, 20, Color(255, 0, 0))  # Красный
-    blue_ball = Ball(200, 100, 0, 0, 20, Color(0, 0, 255))  # Синий
-    
+    red_ball = game.add_ball(100, 100, radius=20)
+    red_ball.color = pack_color(255, 0, 0)  # Красный
+    blue_ball = game.add_ball(200, 100, radius=20)
+    blue_ball.color = pack_color(0, 0, 255)  # Синий
+
     print(f"Исходные цвета:")
-    print(f"  Красный шарик: RGB({red_ball.color.r}, {red_ball.color.g}, {red_ball.color.b})")
-    print(f"  Синий шарик: RGB({blue_ball.color.r}, {blue_ball.color.g}, {blue_ball.color.b})")
-    
+    print(f"  Красный шарик: RGB{unpack_color(red_ball.color)}")
+    print(f"  Синий шарик: RGB{unpack_color(blue_ball.color)}")
+
     # Смешиваем цвета
-    mixed_color = red_ball.color.mix_with(blue_ball.color)
-    print(f"Смешанный цвет: RGB({mixed_color.r}, {mixed_color.g}, {mixed_color.b})")
+    mixed_color = mix_colors(red_ball.color, blue_ball.color)
+    print(f"Смешанный цвет: RGB{unpack_color(mixed_color)}")
     print(f"Ожидаемый результат (среднее): RGB(127, 0, 127) - пурпурный")
-    
+
     # Добавляем несколько шариков в игру
     print(f"\n=== Игровая симуляция ===")
     for i in range(5):
@@ -409,20 +636,20 @@ if __name__ == "__main__":
             y=random.uniform(100, 400),
             radius=random.uniform(15, 25)
         )
-    
+
     # Симуляция игрового цикла
     for frame in range(100):
         game.update()
-        
+
         # Выводим информацию о шариках каждые 20 кадров
         if frame % 20 == 0:
             balls_info = game.get_balls_info()
             print(f"Frame {frame}: {len(balls_info)} balls in game")
-            
+
             for ball_info in balls_info:
                 print(f"  Ball {ball_info['id']}: pos=({ball_info['x']:.1f}, {ball_info['y']:.1f}), "
                       f"color=({ball_info['color'][0]}, {ball_info['color'][1]}, {ball_info['color'][2]}), "
                       f"quality={ball_info['quality']:.2f}")
-    
+
     print(f"\nInventory: {len(game.inventory)} balls")
     print(f"Delete zone: y={game.delete_zone_y}, height={game.delete_zone_height}")